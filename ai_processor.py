@@ -2,6 +2,7 @@ from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassifica
 import re
 import json
 from datetime import datetime
+from email_preprocessor import EmailPreprocessor
 
 class EmailAIProcessor:
     def __init__(self):
@@ -26,6 +27,9 @@ class EmailAIProcessor:
             'major issue', 'completely broken', 'not working at all'
         ]
         
+        # Strips quoted history, signatures and HTML before analysis
+        self.preprocessor = EmailPreprocessor()
+        
         # Knowledge base for response generation
         self.knowledge_base = self._load_knowledge_base()
         
@@ -34,6 +38,10 @@ class EmailAIProcessor:
     def analyze_email(self, subject, body):
         """Comprehensive email analysis"""
         
+        # Clean the body so only the new reply is scored
+        preprocessed = self.preprocessor.preprocess(body, self.sentiment_analyzer.tokenizer)
+        body = preprocessed['text']
+        
         # Combine subject and body for analysis
         full_text = f"{subject} {body}"
         
@@ -64,7 +72,11 @@ class EmailAIProcessor:
             'sentiment_score': round(sentiment_scores[primary_sentiment], 3),
             'priority': priority,
             'category': category,
-            'extracted_info': extracted_info
+            'extracted_info': extracted_info,
+            'preprocessing': {
+                'chars_removed': preprocessed['chars_removed'],
+                'tokens_removed': preprocessed['tokens_removed']
+            }
         }
     
     def _detect_priority(self, subject, body):
@@ -25,7 +25,8 @@ def analyze_email():
             'priority': analysis['priority'], 
             'category': analysis['category'],
             'extracted_info': analysis['extracted_info'],
-            'sentiment_score': analysis['sentiment_score']
+            'sentiment_score': analysis['sentiment_score'],
+            'preprocessing': analysis['preprocessing']
         })
     
     except Exception as e:
@@ -0,0 +1,61 @@
+import time
+from transformers import pipeline
+from email_preprocessor import EmailPreprocessor
+
+# Typical support thread: short new reply on top of quoted history and footers
+SAMPLE_EMAIL = """<html><body>
+<p>Hi team,</p>
+<p>The API is still returning 500 errors after the fix you deployed yesterday. We are completely blocked, please advise.</p>
+<p>Best regards,<br>Jane Doe<br>Acme Corp | 555-123-4567</p>
+<p>CONFIDENTIALITY NOTICE: This email and any attachments are confidential and intended solely for the addressee.
+If you are not the intended recipient, please delete it and notify the sender immediately.</p>
+</body></html>
+On Mon, Oct 12, 2026 at 9:14 AM Support Team <support@company.com> wrote:
+> Thank you for contacting our support team. We've deployed a fix for the
+> integration issue you reported. Please let us know if it persists.
+>
+> On Sun, Oct 11, 2026 at 6:02 PM Jane Doe <jane@acme.com> wrote:
+>> Our integration stopped working this afternoon. Every request to the
+>> orders endpoint fails with a 500 error. This is urgent for us.
+"""
+
+RUNS = 20
+
+
+def _time_inference(analyzer, text):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        analyzer(text)
+    return (time.perf_counter() - start) / RUNS
+
+
+def main():
+    print("Loading sentiment model...")
+    analyzer = pipeline(
+        "sentiment-analysis",
+        model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+        return_all_scores=True
+    )
+    preprocessor = EmailPreprocessor()
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        result = preprocessor.preprocess(SAMPLE_EMAIL, analyzer.tokenizer)
+    preprocess_time = (time.perf_counter() - start) / RUNS
+
+    # Warm up before timing
+    analyzer(SAMPLE_EMAIL)
+    raw_time = _time_inference(analyzer, SAMPLE_EMAIL)
+    clean_time = _time_inference(analyzer, result['text'])
+
+    print(f"Tokens:        {result['original_tokens']} -> {result['cleaned_tokens']} "
+          f"({result['tokens_removed']} removed)")
+    print(f"Characters removed: {result['chars_removed']}")
+    print(f"Preprocessing:  {preprocess_time * 1000:.2f} ms")
+    print(f"Raw inference:  {raw_time * 1000:.2f} ms")
+    print(f"Clean inference: {clean_time * 1000:.2f} ms")
+    print(f"Time saved:     {(raw_time - clean_time - preprocess_time) * 1000:.2f} ms per email")
+
+
+if __name__ == '__main__':
+    main()
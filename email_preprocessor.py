@@ -0,0 +1,290 @@
+import re
+from html import unescape
+
+
+class EmailPreprocessor:
+    """Strip quoted replies, signatures and boilerplate from an email body"""
+
+    # A sign-off only counts as a footer when at most this many non-blank
+    # lines follow it
+    MAX_FOOTER_LINES = 5
+    # Signature lines are short (name, title, company, phone)
+    MAX_SIGNATURE_LINE_LENGTH = 60
+    # Lines after 'From:' searched for the rest of a forwarded header block
+    HEADER_BLOCK_LINES = 4
+
+    def __init__(self):
+        # 'On <date/time or address> ... wrote:' as produced by mail clients
+        self.reply_header_pattern = re.compile(
+            r'^\s*On\s'
+            r'(?=.*?(\d{1,2}:\d{2}'                               # 9:14 AM
+            r'|\d{1,4}[/.-]\d{1,2}[/.-]\d{2,4}'                   # 12/10/2026
+            r'|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b'  # Oct 12
+            r'|\b\d{1,2}\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b'     # 12 Oct
+            r'|<[^<>\s@]+@[^<>\s]+>))'                            # <jane@acme.com>
+            r'.{0,200}\bwrote:\s*$',
+            re.IGNORECASE
+        )
+
+        # Separators that introduce quoted history - everything after is dropped
+        self.separator_patterns = [
+            re.compile(r'^\s*-{2,}\s*Original Message\s*-{2,}\s*$', re.IGNORECASE),
+            re.compile(r'^\s*-{2,}\s*Forwarded message\s*-{2,}\s*$', re.IGNORECASE),
+            re.compile(r'^\s*Begin forwarded message:\s*$', re.IGNORECASE),
+            re.compile(r'^\s*_{10,}\s*$'),
+        ]
+
+        # Outlook-style header block without a separator: From: + Sent:/To:/Subject:
+        self.from_header_pattern = re.compile(r'^\s*From:\s.+$', re.IGNORECASE)
+        self.header_field_pattern = re.compile(r'^\s*(Sent|Date|To|Cc|Subject):\s', re.IGNORECASE)
+
+        # Lines that start a signature block
+        self.signature_patterns = [
+            re.compile(r'^\s*--\s*$'),
+            re.compile(r'^\s*(best|kind|warm)?\s*regards,?\s*$', re.IGNORECASE),
+            re.compile(r'^\s*(thanks|thank you|many thanks|cheers|sincerely),?\s*$', re.IGNORECASE),
+            re.compile(r'^\s*sent from my \w+', re.IGNORECASE),
+        ]
+
+        # Lines that can follow a sign-off: name, title, company, phone, URL
+        self.signature_line_patterns = [
+            re.compile(r'^((tel|phone|mobile|cell|fax|[tmf])\s*[:.]?\s*)?\+?[\d\s().-]{7,}$', re.IGNORECASE),
+            re.compile(r'^(https?://|www\.)\S+$', re.IGNORECASE),
+            re.compile(r"^[A-Z][\w.'&-]*,?(\s+([A-Z][\w.'&-]*,?|of|and|at|for|the|&))*$"),
+        ]
+        self.signature_separator_pattern = re.compile(r'\s+[|\u00b7\u2022-]\s+')
+        self.postscript_pattern = re.compile(r'^\s*p\.?\s?s\b', re.IGNORECASE)
+
+        # Header lines that start a legal / confidentiality footer
+        self.disclaimer_header_pattern = re.compile(
+            r'^\s*(disclaimer|confidentiality notice|legal notice|important notice)\s*:?\s*$',
+            re.IGNORECASE
+        )
+        self.disclaimer_patterns = [
+            re.compile(r'^\s*(confidentiality notice|disclaimer|legal notice)\b', re.IGNORECASE),
+            re.compile(r'^\s*this (e-?mail|message)( and any attachments)? (is|are|may contain)\b', re.IGNORECASE),
+            re.compile(r'^\s*if you are not the intended recipient', re.IGNORECASE),
+        ]
+        self.legal_pattern = re.compile(
+            r'confidential|intended (solely )?(for the )?(recipient|addressee)|privileged'
+            r'|unauthori[sz]ed|prohibited|disclosure|liabilit(y|ies)|legally',
+            re.IGNORECASE
+        )
+        # Customer wording that never belongs to a footer
+        self.request_pattern = re.compile(
+            r'\b(refund|cancel|reset|charged|i need|i cannot|i can\'t|can you|could you'
+            r'|not working|still failing|broken)\b',
+            re.IGNORECASE
+        )
+
+        # Lines that carry no request on their own
+        self.greeting_pattern = re.compile(
+            r'^\s*(hi|hello|hey|dear|greetings|good (morning|afternoon|evening))\b[^\n]{0,40}$',
+            re.IGNORECASE
+        )
+
+        # A closing, void or well-formed block tag is needed, so 'a<b and c>d'
+        # stays plain text
+        self.html_detect_pattern = re.compile(
+            r'</\s*(html|head|body|div|p|span|table|tbody|thead|tr|td|th|ul|ol|li|'
+            r'a|b|i|u|em|strong|font|blockquote|h[1-6]|style|script|center|pre)\s*>'
+            r'|<\s*(br|hr|img|meta)\b[^<>]*>'
+            r'|<(html|body|div|p|table|tr|td|th|ul|ol|li|blockquote|h[1-6])'
+            r'(\s+[\w:-]+\s*=\s*("[^"<>]*"|\'[^\'<>]*\'|[^\s"\'<>]+))*\s*>'
+            r'|<!doctype\s',
+            re.IGNORECASE
+        )
+        # '[^<>]' keeps every tag pattern from scanning past the next '<'
+        self.html_drop_pattern = re.compile(r'<\s*(/?)\s*(script|style|head)\b[^<>]*>', re.IGNORECASE)
+        self.html_blockquote_pattern = re.compile(r'<\s*(/?)\s*blockquote\b[^<>]*>', re.IGNORECASE)
+        self.html_break_pattern = re.compile(
+            r'(<\s*/?\s*(br|p|div|tr|li|h[1-6]|table|ul|ol|hr)\b[^<>]*>\s*)+', re.IGNORECASE
+        )
+        self.html_cell_pattern = re.compile(r'<\s*/?\s*(td|th)\b[^<>]*>', re.IGNORECASE)
+        # Real tags only, so '<jane@acme.com>' survives
+        self.html_tag_pattern = re.compile(r'<![^<>]*>|</?[a-zA-Z][a-zA-Z0-9:-]*(\s[^<>]*)?/?>')
+        self.token_pattern = re.compile(r'\w+|[^\w\s]')
+
+    def preprocess(self, text, tokenizer=None):
+        """Clean an email body and report how much was removed"""
+        original = text or ''
+
+        plain = self._strip_html(original)
+        lines = plain.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        unquoted = self._strip_quoted(lines)
+        unfootered = self._strip_footer(unquoted)
+
+        # Never leave the model with only a greeting - back off one stage at a time
+        for candidate in (unfootered, unquoted, lines):
+            if self._has_content(candidate):
+                break
+        cleaned = self._collapse_whitespace('\n'.join(candidate))
+
+        original_tokens = self.count_tokens(original, tokenizer)
+        cleaned_tokens = self.count_tokens(cleaned, tokenizer)
+
+        return {
+            'text': cleaned,
+            'chars_removed': len(original) - len(cleaned),
+            'tokens_removed': original_tokens - cleaned_tokens,
+            'original_tokens': original_tokens,
+            'cleaned_tokens': cleaned_tokens
+        }
+
+    def count_tokens(self, text, tokenizer=None):
+        """Count tokens with the model tokenizer if given, else a word/punctuation split"""
+        if not text:
+            return 0
+        if tokenizer is not None:
+            return len(tokenizer.tokenize(text))
+        return len(self.token_pattern.findall(text))
+
+    def _strip_html(self, text):
+        """Convert HTML to plain text"""
+        if not self.html_detect_pattern.search(text):
+            return text
+        text = self._strip_comments(text)
+        text = self._strip_elements(text, self.html_drop_pattern)
+        text = self._strip_elements(text, self.html_blockquote_pattern)
+        text = self.html_break_pattern.sub('\n', text)
+        text = self.html_cell_pattern.sub(' ', text)
+        text = self.html_tag_pattern.sub('', text)
+        return unescape(text)
+
+    def _strip_comments(self, text):
+        """Remove <!-- --> comments in a single pass"""
+        kept = []
+        position = 0
+        while True:
+            start = text.find('<!--', position)
+            if start == -1:
+                break
+            kept.append(text[position:start])
+            end = text.find('-->', start + 4)
+            if end == -1:
+                return ''.join(kept)
+            position = end + 3
+        kept.append(text[position:])
+        return ''.join(kept)
+
+    def _strip_elements(self, text, tag_pattern):
+        """Remove the elements matched by tag_pattern, including nested ones, in a single pass"""
+        kept = []
+        depth = 0
+        position = 0
+        for match in tag_pattern.finditer(text):
+            if depth == 0:
+                kept.append(text[position:match.start()])
+            if match.group(1):
+                depth = max(depth - 1, 0)
+            else:
+                depth += 1
+            position = match.end()
+        if depth == 0:
+            kept.append(text[position:])
+        return ''.join(kept)
+
+    def _strip_quoted(self, lines):
+        """Drop '>' lines and everything after a reply or forward header"""
+        kept = []
+        for i, line in enumerate(lines):
+            if self._is_quote_header(lines, i):
+                break
+            if line.lstrip().startswith('>'):
+                continue
+            kept.append(line)
+        return kept
+
+    def _is_quote_header(self, lines, i):
+        """Check whether lines[i] starts quoted or forwarded history"""
+        line = lines[i]
+        if any(p.match(line) for p in self.separator_patterns):
+            return True
+
+        if self.reply_header_pattern.match(line):
+            return True
+        # 'On ... wrote:' is often wrapped over two lines by mail clients
+        if i + 1 < len(lines) and self.reply_header_pattern.match(f"{line} {lines[i + 1]}"):
+            return True
+
+        if self.from_header_pattern.match(line):
+            following = lines[i + 1:i + 1 + self.HEADER_BLOCK_LINES]
+            fields = {m.group(1).lower() for m in map(self.header_field_pattern.match, following) if m}
+            return len(fields) >= 2
+        return False
+
+    def _strip_footer(self, lines):
+        """Drop the disclaimer and then the signature block at the end of the message"""
+        lines = lines[:self._find_disclaimer(lines)]
+        return lines[:self._find_signature(lines)]
+
+    def _find_disclaimer(self, lines):
+        """Index of the legal footer at the end of lines, or len(lines)
+
+        Walks back from the end. Every paragraph below the cut must read as
+        boilerplate and nothing below it may look like a customer request.
+        """
+        cut = len(lines)
+        paragraph_is_legal = False
+        for i in range(len(lines) - 1, 0, -1):
+            line = lines[i]
+            if not line.strip():
+                # A paragraph without legal wording ends the footer
+                if not paragraph_is_legal:
+                    break
+                paragraph_is_legal = False
+                continue
+            if self.request_pattern.search(line):
+                break
+            is_header = self.disclaimer_header_pattern.match(line)
+            if is_header or self.legal_pattern.search(line):
+                paragraph_is_legal = True
+            if is_header or (
+                any(p.match(line) for p in self.disclaimer_patterns)
+                and self.legal_pattern.search(line)
+            ):
+                cut = i
+        return cut
+
+    def _find_signature(self, lines):
+        """Index of the sign-off that only signature lines follow, or len(lines)"""
+        tail_lines = 0
+        for i in range(len(lines) - 1, 0, -1):
+            line = lines[i].strip()
+            if not line:
+                continue
+            if any(p.match(line) for p in self.signature_patterns):
+                return i
+            # Nothing above this can be followed by a short enough tail
+            tail_lines += 1
+            if tail_lines > self.MAX_FOOTER_LINES or not self._is_signature_line(line):
+                break
+        return len(lines)
+
+    def _is_signature_line(self, line):
+        """Check whether a line looks like a name, title, company, phone or URL"""
+        if self.postscript_pattern.match(line) or '@' in line:
+            return False
+        if len(line) > self.MAX_SIGNATURE_LINE_LENGTH or self.request_pattern.search(line):
+            return False
+        parts = self.signature_separator_pattern.split(line)
+        return all(any(p.match(part) for p in self.signature_line_patterns) for part in parts)
+
+    def _has_content(self, lines):
+        """Check whether any line is more than a greeting or sign-off"""
+        for line in lines:
+            if not line.strip():
+                continue
+            if self.greeting_pattern.match(line):
+                continue
+            if any(p.match(line) for p in self.signature_patterns):
+                continue
+            return True
+        return False
+
+    def _collapse_whitespace(self, text):
+        """Collapse runs of spaces and blank lines"""
+        text = re.sub(r'[ \t\xa0]+', ' ', text)
+        text = re.sub(r' *\n *', '\n', text)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        return text.strip()
@@ -0,0 +1,101 @@
+import importlib
+import sys
+import types
+import unittest
+from unittest import mock
+
+try:
+    import flask
+except ImportError:
+    flask = None
+
+
+class StubTokenizer:
+    def tokenize(self, text):
+        return text.split()
+
+
+class StubSentimentPipeline:
+    """Stands in for the transformers sentiment pipeline and records its input"""
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.inputs = []
+
+    def __call__(self, text):
+        self.inputs.append(text)
+        return [[
+            {'label': 'LABEL_0', 'score': 0.7},
+            {'label': 'LABEL_1', 'score': 0.2},
+            {'label': 'LABEL_2', 'score': 0.1}
+        ]]
+
+
+def _stub_transformers(sentiment_pipeline):
+    transformers = types.ModuleType('transformers')
+    transformers.pipeline = lambda *args, **kwargs: sentiment_pipeline
+    transformers.AutoTokenizer = None
+    transformers.AutoModelForSequenceClassification = None
+    return mock.patch.dict(sys.modules, {'transformers': transformers})
+
+
+THREAD = ("I was charged twice, please refund me. Reach me at jane@acme.com\n\n"
+          "On Mon, Oct 12, 2026 at 9:14 AM Support <support@company.com> wrote:\n"
+          "> Your password reset link is below. Our outage is resolved.\n"
+          "> Contact billing@company.com")
+CLEANED = "I was charged twice, please refund me. Reach me at jane@acme.com"
+
+
+class EmailAIProcessorTest(unittest.TestCase):
+    def setUp(self):
+        self.sentiment_pipeline = StubSentimentPipeline()
+        with _stub_transformers(self.sentiment_pipeline):
+            ai_processor = importlib.reload(importlib.import_module('ai_processor'))
+            self.processor = ai_processor.EmailAIProcessor()
+
+    def test_analyzes_cleaned_body(self):
+        analysis = self.processor.analyze_email('Double charge', THREAD)
+
+        self.assertEqual(
+            self.sentiment_pipeline.inputs,
+            [f"Double charge {CLEANED}"]
+        )
+        # Quoted 'outage' and 'password reset' no longer drive priority, category or extraction
+        self.assertEqual(analysis['priority'], 'Normal')
+        self.assertEqual(analysis['category'], 'Billing')
+        self.assertEqual(analysis['extracted_info'], {
+            'contact_emails': ['jane@acme.com'],
+            'request_type': 'refund_request'
+        })
+
+    def test_reports_preprocessing(self):
+        analysis = self.processor.analyze_email('Double charge', THREAD)
+
+        self.assertEqual(analysis['preprocessing'], {
+            'chars_removed': len(THREAD) - len(CLEANED),
+            'tokens_removed': len(THREAD.split()) - len(CLEANED.split())
+        })
+
+
+@unittest.skipUnless(flask, 'flask is not installed')
+class AnalyzeEmailEndpointTest(unittest.TestCase):
+    def setUp(self):
+        with _stub_transformers(StubSentimentPipeline()):
+            sys.modules.pop('ai_processor', None)
+            sys.modules.pop('app', None)
+            self.app = importlib.import_module('app').app
+
+    def test_returns_preprocessing(self):
+        response = self.app.test_client().post(
+            '/api/analyze-email', json={'subject': 'Double charge', 'body': THREAD}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['preprocessing'], {
+            'chars_removed': len(THREAD) - len(CLEANED),
+            'tokens_removed': len(THREAD.split()) - len(CLEANED.split())
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import time
+import unittest
+
+from email_preprocessor import EmailPreprocessor
+
+
+class EmailPreprocessorTest(unittest.TestCase):
+    def setUp(self):
+        self.preprocessor = EmailPreprocessor()
+
+    def clean(self, text):
+        return self.preprocessor.preprocess(text)['text']
+
+    # Quoted history
+
+    def test_strips_quoted_lines(self):
+        text = "The export is still failing.\n> Please try again.\n>> Export fails."
+        self.assertEqual(self.clean(text), "The export is still failing.")
+
+    def test_strips_one_line_reply_header(self):
+        text = ("Still broken.\n\n"
+                "On Mon, Oct 12, 2026 at 9:14 AM Support <support@company.com> wrote:\n"
+                "We deployed a fix.")
+        self.assertEqual(self.clean(text), "Still broken.")
+
+    def test_strips_wrapped_reply_header(self):
+        text = ("Still broken.\n\n"
+                "On 12/10/2026 09:14, Jane Doe\n"
+                "wrote:\n"
+                "Old message")
+        self.assertEqual(self.clean(text), "Still broken.")
+
+    def test_keeps_on_sentence_ending_in_wrote(self):
+        text = "Hi,\nOn the dashboard, as my colleague wrote:\nthe refund button is broken."
+        self.assertEqual(self.clean(text), text)
+
+    def test_strips_forwarded_message(self):
+        text = ("See below.\n"
+                "---------- Forwarded message ---------\n"
+                "From: Jane <jane@acme.com>\n"
+                "Old content")
+        self.assertEqual(self.clean(text), "See below.")
+
+    def test_strips_original_message(self):
+        text = "See below.\n-----Original Message-----\nOld content"
+        self.assertEqual(self.clean(text), "See below.")
+
+    def test_strips_outlook_header_block(self):
+        text = ("Any update?\n"
+                "From: Support <support@company.com>\n"
+                "Sent: Monday, October 12, 2026 9:14 AM\n"
+                "To: Jane Doe\n"
+                "Subject: RE: Export\n"
+                "Old content")
+        self.assertEqual(self.clean(text), "Any update?")
+
+    def test_keeps_from_sentence_in_body(self):
+        text = "Hello,\nFrom: the billing page I get an error.\nIt says invoice not found. Refund please."
+        self.assertEqual(self.clean(text), text)
+
+    # Footers
+
+    def test_strips_signature(self):
+        text = "The export is failing.\n\nBest regards,\nJane Doe\nAcme Corp | 555-123-4567"
+        self.assertEqual(self.clean(text), "The export is failing.")
+
+    def test_strips_dash_signature(self):
+        text = "The export is failing.\n-- \nJane Doe"
+        self.assertEqual(self.clean(text), "The export is failing.")
+
+    def test_strips_signature_and_disclaimer(self):
+        text = ("The export is failing.\n"
+                "Thanks,\n"
+                "Jane\n"
+                "CONFIDENTIALITY NOTICE: This email and any attachments are confidential and "
+                "intended solely for the addressee. If you are not the intended recipient, "
+                "please delete it.")
+        self.assertEqual(self.clean(text), "The export is failing.")
+
+    def test_strips_wrapped_disclaimer_and_signature_above_it(self):
+        text = ("The export still fails with a timeout.\n\n"
+                "Best regards,\n"
+                "Jane Doe\n"
+                "Acme Corp\n\n"
+                "CONFIDENTIALITY NOTICE: This email and any attachments are confidential\n"
+                "and may contain privileged information intended solely for the use of the\n"
+                "addressee. If you are not the intended recipient, you are hereby notified\n"
+                "that any review, dissemination, distribution or copying of this message is\n"
+                "strictly prohibited. If you have received this email in error, please\n"
+                "notify the sender immediately and delete it from your system. Acme Corp\n"
+                "accepts no liability for any damage caused by this message.")
+        self.assertEqual(self.clean(text), "The export still fails with a timeout.")
+
+    def test_keeps_disclaimer_sentence_in_body(self):
+        text = ("The API returns 500.\n"
+                "Disclaimer: I may be wrong, but you charged me twice and I need a refund now.")
+        self.assertEqual(self.clean(text), text)
+
+    def test_keeps_postscript_after_sign_off(self):
+        text = "Login works now.\nRegards,\nJane\nP.S. I still cannot reset password for bob@acme.com"
+        self.assertEqual(self.clean(text), text)
+
+    def test_keeps_request_after_sign_off(self):
+        text = "Got the replacement card.\nThanks,\nbut please cancel order 4411\nand refund it"
+        self.assertEqual(self.clean(text), text)
+
+    def test_strips_signature_with_title_phone_and_url(self):
+        text = ("Fixed.\nThanks,\nJane Doe\nSenior Support Engineer, Acme\n"
+                "T: +1 555 123 4567 | www.acme.com")
+        self.assertEqual(self.clean(text), "Fixed.")
+
+    def test_keeps_thanks_in_body(self):
+        text = "Hi team,\nThanks,\nthe login is still failing after reset and we are blocked."
+        self.assertEqual(self.clean(text), text)
+
+    def test_keeps_message_that_is_only_a_sign_off(self):
+        self.assertEqual(self.clean("Thanks!"), "Thanks!")
+
+    # HTML
+
+    def test_strips_html(self):
+        text = "<html><body><p>Hello&nbsp;team</p><p>Login &amp; reset fail</p></body></html>"
+        self.assertEqual(self.clean(text), "Hello team\nLogin & reset fail")
+
+    def test_strips_nested_blockquotes(self):
+        text = ("<div>New reply</div>"
+                "<blockquote>A<blockquote>B</blockquote>LEAKED old text</blockquote>")
+        self.assertEqual(self.clean(text), "New reply")
+
+    def test_separates_table_cells(self):
+        self.assertEqual(self.clean("<table><tr><td>Name</td><td>Jane</td></tr></table>"), "Name Jane")
+
+    def test_breaks_on_unclosed_paragraphs(self):
+        self.assertEqual(self.clean("<p>Line one<p>Line two"), "Line one\nLine two")
+
+    def test_keeps_address_brackets_in_plain_text(self):
+        text = "Please reach me at <jane@acme.com> or 555-123-4567."
+        self.assertEqual(self.clean(text), text)
+
+    def test_keeps_angle_brackets_in_plain_text(self):
+        self.assertEqual(self.clean("Check a<b and c>d"), "Check a<b and c>d")
+
+    def test_keeps_escaped_address_in_html(self):
+        text = "<p>Reach me at &lt;jane@acme.com&gt;</p>"
+        self.assertEqual(self.clean(text), "Reach me at <jane@acme.com>")
+
+    # Stats and edge cases
+
+    def test_collapses_whitespace(self):
+        self.assertEqual(self.clean("  Export\t\tfails \n\n\n\n now  "), "Export fails\n\nnow")
+
+    def test_reports_removed_counts(self):
+        text = "Still broken.\n> old quoted text"
+        result = self.preprocessor.preprocess(text)
+        self.assertEqual(result['chars_removed'], len(text) - len("Still broken."))
+        self.assertEqual(result['tokens_removed'], 4)
+        self.assertEqual(result['cleaned_tokens'], 3)
+
+    def test_counts_tokens_with_tokenizer(self):
+        class StubTokenizer:
+            def tokenize(self, text):
+                return list(text.replace(' ', ''))
+
+        result = self.preprocessor.preprocess("Still broken.\n> old", StubTokenizer())
+        self.assertEqual(result['original_tokens'], len("Stillbroken.\n>old"))
+        self.assertEqual(result['cleaned_tokens'], len("Stillbroken."))
+        self.assertEqual(result['tokens_removed'], 5)
+
+    def test_long_footer_lines_are_linear(self):
+        start = time.perf_counter()
+        self.preprocessor.preprocess("Hi\n" + "--\n" * 20000 + "Still broken.")
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_unclosed_html_tags_are_linear(self):
+        start = time.perf_counter()
+        self.preprocessor.preprocess("</p>" + "<style" * 8000)
+        self.preprocessor.preprocess("</p>" + "<!--" * 8000)
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_empty_and_none_input(self):
+        for text in ('', None):
+            result = self.preprocessor.preprocess(text)
+            self.assertEqual(result['text'], '')
+            self.assertEqual(result['chars_removed'], 0)
+            self.assertEqual(result['tokens_removed'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()